@@ -5,19 +5,48 @@ import random
 import json
 import math
 import uuid
+import queue
+import atexit
+import logging
+import threading
+from collections import deque
+from functools import partial
 
-from solve import hanoi_solver
-from utils import draw_text, ease_out_quad, Particle, TextInputBox
+from solve import hanoi_moves
+from utils import draw_text, make_static_text, ease_out_quad, arc_point, coalesce_mouse_motion, ParticleSystem, TextInputBox
+
+logger = logging.getLogger(__name__)
 
 # --- Configuration & Colors ---
 WIDTH, HEIGHT = 1280, 720
 FPS = 60
+MOVE_FRAMES = int(0.4 * FPS)  # Animation ticks per solver move
+MOVE_EASING = [ease_out_quad(i / MOVE_FRAMES) for i in range(MOVE_FRAMES)]  # Eased progress of each tick
 WHITE = (255, 255, 255); GOLD = (255, 215, 0); PRIMARY_BLUE = (0, 91, 181)
 SECONDARY_BLUE = (69, 123, 157); STOP_RED = (217, 4, 41)
+HOVER_COLORS = {c: tuple(min(255, v * 1.2) for v in c) for c in (PRIMARY_BLUE, SECONDARY_BLUE, STOP_RED)}  # 20% brighter
 DISK_PALETTE = [
     (230, 57, 70), (241, 128, 45), (252, 192, 21),
     (168, 218, 220), (69, 123, 157), (29, 53, 87)
 ]
+# States whose frame changes every tick without input (blinking cursor); the game
+# timer and win particles are checked in idle_frame_changed, everything else is
+# only redrawn after an event
+ANIMATED_STATES = {'get_name'}
+GAME_STATES = ('menu', 'get_name', 'game', 'win', 'scoreboard', 'how_to_play', 'solver_explanation', 'history')
+# Event types each state reacts to; MOUSEMOTION and WINDOWEXPOSED only serve to
+# redraw hover highlights and exposed windows. Anything else is skipped by run().
+BUTTON_SCREEN_EVENTS = [pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION, pygame.WINDOWEXPOSED]
+STATE_EVENTS = {
+    'menu': BUTTON_SCREEN_EVENTS,
+    'get_name': [pygame.QUIT, pygame.KEYDOWN, pygame.TEXTINPUT, pygame.MOUSEBUTTONDOWN],
+    'game': [pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.WINDOWEXPOSED],
+    'win': [pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.WINDOWEXPOSED],
+    'scoreboard': BUTTON_SCREEN_EVENTS,
+    'how_to_play': BUTTON_SCREEN_EVENTS,
+    'solver_explanation': BUTTON_SCREEN_EVENTS,
+    'history': BUTTON_SCREEN_EVENTS,
+}
 
 class HanoiGUI:
     def __init__(self):
@@ -25,13 +54,22 @@ class HanoiGUI:
         pygame.mixer.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Tours de Hanoï")
+        # Only let through the event types the handlers use (TEXTINPUT feeds KEYDOWN.unicode
+        # for name entry, WINDOWEXPOSED triggers a redraw of idle screens); SDL drops the rest
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.TEXTINPUT, pygame.MOUSEBUTTONDOWN,
+                                  pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.WINDOWEXPOSED])
         self.clock = pygame.time.Clock()
 
         # Initialize all attributes to default values before use
         self.game_state = ''
         self.scores = []
-        self.particles = []
+        self.write_queue = queue.Queue()  # (kind, payload) jobs for the persistence thread
+        self.particles = ParticleSystem()
         self.ui_buttons = {}
+        self.button_names = []  # Parallel to button_rects/button_actions, rebuilt by set_buttons
+        self.button_rects = []
+        self.button_actions = []
         self.animating = False
         self.dragging_disk = None
         self.source_tower_idx = -1
@@ -40,26 +78,39 @@ class HanoiGUI:
         self.towers = []
         self.disks = []
         self.tower_rects = []
+        self.tower_bands = []  # Drop zones as (left, right, top, bottom) int tuples
         self.n = 0
         self.min_moves = 0
+        self.min_moves_text = None  # Pre-rendered "Minimum" label of the current game
+        self.win_texts = []  # Pre-rendered win screen messages
         self.selected_score_difficulty = 5
+        self.score_row_blits = []  # (surface, pos) pairs of the top-10 table for the selected difficulty
         self.pending_disks = 0
         self.name_input = None
         self.is_solver_used = False  # Track if solver was used
         self.move_history = []  # Track moves in current game
+        self.recent_move_surfs = deque(maxlen=5)  # Rendered labels of the last 5 moves
+        self.full_move_history = None  # Archive of past games, read on first use
         self.game_id = str(uuid.uuid4())  # Unique ID for current game
+        self.dirty = True  # Whether the next frame must be redrawn
+        self.win_bg = None  # Snapshot of the finished board behind the win screen
+        self.shown_seconds = None  # Timer value on screen, to know when it goes stale
+        self.text_cache = {}  # Rendered text surfaces keyed by (text, font, color)
+        self.label_cache = {}  # Slot name -> (text, surface) for labels that keep changing
+        # State name -> bound handler/drawer, resolved once instead of per event and frame
+        self.event_handlers = {state: getattr(self, f'handle_{state}_events') for state in GAME_STATES}
+        self.drawers = {state: getattr(self, f'draw_{state}') for state in GAME_STATES}
 
         try:
             self.load_assets()
             self.load_scoreboard()
-            self.load_move_history()
+            self.start_writer()
             self.setup_menu()  # Set the initial state
             if pygame.mixer.get_init():
                 pygame.mixer.music.play(-1)
         except Exception as e:
             print(f"Initialization error: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"Initialization error: {str(e)}\n")
+            logger.critical("Initialization error: %s", e, exc_info=True)
             raise
 
     def load_assets(self):
@@ -67,16 +118,26 @@ class HanoiGUI:
         assets_path = os.path.join(script_path, 'assets')
         def asset(f): return os.path.join(assets_path, f)
         try:
-            self.background_img = pygame.transform.scale(pygame.image.load(asset('background.jpg')).convert(), (WIDTH, HEIGHT))
+            # Scale the full-size JPEG down before converting, so only WIDTH x HEIGHT pixels get converted
+            self.background_img = pygame.transform.scale(pygame.image.load(asset('background.jpg')), (WIDTH, HEIGHT)).convert()
             logo = pygame.image.load(asset('logo.png')).convert_alpha()
             self.logo_img = pygame.transform.scale(logo, (logo.get_width() // 2, logo.get_height() // 2))  # Scale to 85x25
-            w, h = self.background_img.get_size()
-            pixelated = pygame.transform.scale(self.background_img, (w // 20, h // 20))
-            self.blurred_background = pygame.transform.scale(pixelated, (w, h))
+            self.logo_pos = (WIDTH - self.logo_img.get_width() - 30, 30)  # Top-right corner
+            # draw.rect writes RGBA straight into an SRCALPHA surface without blending,
+            # so the overlay is a uniform translucent black; build it once and reuse
+            self.frosted_overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA).convert_alpha()
+            self.frosted_overlay.fill((0, 0, 0, 100))
+            # Background with the overlay already blended in, for screens that always show both
+            self.frosted_bg = self.background_img.copy()
+            self.frosted_bg.blit(self.frosted_overlay, (0, 0))
             self.title_font = pygame.font.Font(asset('font.ttf'), 72)
             self.menu_font = pygame.font.Font(asset('font.ttf'), 40)
             self.ui_font = pygame.font.Font(asset('font.ttf'), 28)
             self.credit_font = pygame.font.Font(asset('font.ttf'), 16)  # New smaller font for credits
+            # Labels with fixed text and position, rendered once as (surface, rect)
+            self.credits_text = make_static_text("Designed by Redha_AGGOUN@La Plateforme_ 11.07.2025", self.credit_font, (255, 255, 255, 150), WIDTH / 2, HEIGHT - 20, centered=True)
+            self.recent_moves_title = make_static_text("Derniers Coups:", self.ui_font, GOLD, 40, 160)
+            self.history_title = make_static_text("Historique des Parties", self.title_font, GOLD, WIDTH / 2, 50, centered=True)
             self.sounds = {
                 'pickup': pygame.mixer.Sound(asset('pickup.wav')), 'drop': pygame.mixer.Sound(asset('drop.wav')),
                 'invalid': pygame.mixer.Sound(asset('invalid.wav')), 'win': pygame.mixer.Sound(asset('win.wav'))
@@ -92,52 +153,91 @@ class HanoiGUI:
         except (FileNotFoundError, json.JSONDecodeError): self.scores = []
 
     def load_move_history(self):
+        # Only the history screen and the end of a game need the archive, so it is
+        # read on first use instead of at startup; one JSON record per line
+        if self.full_move_history is not None: return
         try:
-            with open('move_history.json', 'r') as f: self.full_move_history = json.load(f)
+            with open('move_history.jsonl', 'r') as f: self.full_move_history = [json.loads(line) for line in f if line.strip()]
         except (FileNotFoundError, json.JSONDecodeError): self.full_move_history = []
 
+    def start_writer(self):
+        # One persistence thread for the whole session, so saving never blocks a frame.
+        # It is a daemon, and stop_writer runs at exit to let it finish the pending jobs.
+        self.writer = threading.Thread(target=self.run_writer, daemon=True)
+        self.writer.start()
+        atexit.register(self.stop_writer)
+
+    def stop_writer(self):
+        self.write_queue.put((None, None))
+        self.writer.join()
+
+    def run_writer(self):
+        while True:
+            # Take everything queued so far: history records are appended in order and
+            # only the newest scoreboard snapshot is written
+            jobs = [self.write_queue.get()]
+            try:
+                while True: jobs.append(self.write_queue.get_nowait())
+            except queue.Empty:
+                pass
+            scores = None
+            for kind, payload in jobs:
+                if kind == 'scoreboard': scores = payload
+                elif kind == 'move_history': self.append_move_history(payload)
+            if scores is not None: self.write_scoreboard(scores)
+            if any(kind is None for kind, _ in jobs): return
+
     def save_scoreboard(self):
+        # The writer gets a snapshot since the main thread keeps appending to self.scores
+        self.write_queue.put(('scoreboard', list(self.scores)))
+
+    def write_scoreboard(self, scores):
         try:
-            with open('scoreboard.json', 'w') as f: json.dump(self.scores, f, indent=4)
+            with open('scoreboard.json', 'w') as f: json.dump(scores, f, indent=4)
         except Exception as e:
             print(f"Error saving scoreboard: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"save_scoreboard error: {str(e)}\n")
+            logger.exception("save_scoreboard error: %s", e)
 
-    def save_move_history(self):
+    def save_move_history(self, record):
+        self.write_queue.put(('move_history', record))
+
+    def append_move_history(self, record):
+        # Append only the finished game instead of rewriting the whole archive
         try:
-            with open('move_history.json', 'w') as f: json.dump(self.full_move_history, f, indent=4)
+            with open('move_history.jsonl', 'a') as f: f.write(json.dumps(record) + "\n")
         except Exception as e:
             print(f"Error saving move history: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"save_move_history error: {str(e)}\n")
+            logger.exception("save_move_history error: %s", e)
 
     def run(self):
         while True:
             self.clock.tick(FPS)
             
             try:
-                # 1. Handle Events for the current state
-                events = pygame.event.get()
-                for event in events:
+                # 1. Handle Events for the current state (one queue drain per frame, in
+                # arrival order, with mouse-motion bursts collapsed to the newest position)
+                handled = False
+                for event in coalesce_mouse_motion(pygame.event.get()):
                     if event.type == pygame.QUIT:
                         pygame.quit()
                         sys.exit()
                     
-                    # Dynamically call the correct event handler
-                    handler = getattr(self, f'handle_{self.game_state}_events', self.handle_null_events)
-                    handler(event)
-
-                # 2. Draw the current state
-                drawer = getattr(self, f'draw_{self.game_state}', self.draw_null_state)
-                drawer()
+                    # Looked up per event: a click can switch states mid-batch
+                    if event.type not in STATE_EVENTS.get(self.game_state, ()): continue
+                    self.event_handlers.get(self.game_state, self.handle_null_events)(event)
+                    handled = True
+                if handled or self.idle_frame_changed(): self.dirty = True
+
+                # 2. Draw the current state, skipping idle frames of static screens
+                if not self.dirty: continue
+                self.drawers.get(self.game_state, self.draw_null_state)()
             except Exception as e:
                 print(f"Error in main loop: {e}")
-                with open("error.log", "a") as f:
-                    f.write(f"Main loop error: {str(e)}, game_state={self.game_state}, n={self.n}, towers={self.towers}\n")
+                logger.critical("Main loop error: %s, game_state=%s, n=%s, towers=%s", e, self.game_state, self.n, self.towers, exc_info=True)
                 raise
 
             pygame.display.flip()
+            self.dirty = False
     
     def handle_null_events(self, event):
         pass # A safe fallback event handler
@@ -148,160 +248,167 @@ class HanoiGUI:
 
     # --- STATE SETUP ---
     def setup_menu(self):
-        try:
-            self.game_state = 'menu'
-            self.ui_buttons = {}
-            w, h, g = 200, 70, 20
-            # Top button: 8 disks
-            self.ui_buttons['disk_8'] = {'rect': pygame.Rect((WIDTH - w) / 2, 300, w, h), 'text': '8 Disques'}
-            # Middle row: 6 and 7 disks
-            self.ui_buttons['disk_6'] = {'rect': pygame.Rect((WIDTH - w * 2 - g) / 2, 390, w, h), 'text': '6 Disques'}
-            self.ui_buttons['disk_7'] = {'rect': pygame.Rect((WIDTH + g) / 2, 390, w, h), 'text': '7 Disques'}
-            # Bottom row: 3, 4, 5 disks
-            self.ui_buttons['disk_3'] = {'rect': pygame.Rect((WIDTH - w * 3 - g * 2) / 2, 480, w, h), 'text': '3 Disques'}
-            self.ui_buttons['disk_4'] = {'rect': pygame.Rect((WIDTH - w) / 2, 480, w, h), 'text': '4 Disques'}
-            self.ui_buttons['disk_5'] = {'rect': pygame.Rect((WIDTH + w + g * 2) / 2, 480, w, h), 'text': '5 Disques'}
-            # Top-left: Scores, How to Play, and Solver Explanation
-            self.ui_buttons['scoreboard'] = {'rect': pygame.Rect(30, 30, 150, 60), 'text': 'Scores'}
-            self.ui_buttons['how_to_play'] = {'rect': pygame.Rect(30, 100, 150, 60), 'text': 'Comment?'}
-            self.ui_buttons['solver?'] = {'rect': pygame.Rect(30, 170, 150, 60), 'text': 'Solveur?'}
-        except Exception as e:
-            print(f"Error in setup_menu: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"setup_menu error: {str(e)}\n")
-            raise
+        self.game_state = 'menu'
+        buttons = {}
+        w, h, g = 200, 70, 20
+        # Top button: 8 disks
+        buttons['disk_8'] = {'rect': pygame.Rect((WIDTH - w) / 2, 300, w, h), 'text': '8 Disques', 'action': partial(self.setup_get_name, 8)}
+        # Middle row: 6 and 7 disks
+        buttons['disk_6'] = {'rect': pygame.Rect((WIDTH - w * 2 - g) / 2, 390, w, h), 'text': '6 Disques', 'action': partial(self.setup_get_name, 6)}
+        buttons['disk_7'] = {'rect': pygame.Rect((WIDTH + g) / 2, 390, w, h), 'text': '7 Disques', 'action': partial(self.setup_get_name, 7)}
+        # Bottom row: 3, 4, 5 disks
+        buttons['disk_3'] = {'rect': pygame.Rect((WIDTH - w * 3 - g * 2) / 2, 480, w, h), 'text': '3 Disques', 'action': partial(self.setup_get_name, 3)}
+        buttons['disk_4'] = {'rect': pygame.Rect((WIDTH - w) / 2, 480, w, h), 'text': '4 Disques', 'action': partial(self.setup_get_name, 4)}
+        buttons['disk_5'] = {'rect': pygame.Rect((WIDTH + w + g * 2) / 2, 480, w, h), 'text': '5 Disques', 'action': partial(self.setup_get_name, 5)}
+        # Top-left: Scores, How to Play, and Solver Explanation
+        buttons['scoreboard'] = {'rect': pygame.Rect(30, 30, 150, 60), 'text': 'Scores', 'action': self.setup_scoreboard}
+        buttons['how_to_play'] = {'rect': pygame.Rect(30, 100, 150, 60), 'text': 'Comment?', 'action': self.setup_how_to_play}
+        buttons['solver?'] = {'rect': pygame.Rect(30, 170, 150, 60), 'text': 'Solveur?', 'action': self.setup_solver_explanation}
+        self.set_buttons(buttons)
+        # Everything but the buttons is static: compose it once for draw_menu
+        self.static_bg = self.new_static_layer(frosted=False)
+        draw_text(self.static_bg, "Tours de Hanoï", self.title_font, WHITE, WIDTH / 2, 150, centered=True)
+        draw_text(self.static_bg, "Choisissez une difficulté", self.menu_font, GOLD, WIDTH / 2, 220, centered=True)
+        self.static_bg.blit(self.logo_img, self.logo_pos)  # Logo top-right
+        self.draw_credits(self.static_bg)
 
     def setup_get_name(self, num_disks):
-        try:
-            self.game_state = 'get_name'
-            self.pending_disks = max(1, num_disks)  # Ensure at least 1 disk
-            self.name_input = TextInputBox(WIDTH / 2 - 200, HEIGHT / 2 - 25, 400, 60, self.menu_font, self.player_name)
-            self.move_history = []  # Reset move history for new game
-            self.game_id = str(uuid.uuid4())  # New game ID
-        except Exception as e:
-            print(f"Error in setup_get_name: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"setup_get_name error: {str(e)}, num_disks={num_disks}, player_name={self.player_name}\n")
-            raise
+        self.game_state = 'get_name'
+        self.pending_disks = max(1, num_disks)  # Ensure at least 1 disk
+        self.name_input = TextInputBox(WIDTH / 2 - 200, HEIGHT / 2 - 25, 400, 60, self.menu_font, self.player_name)
+        self.move_history = []  # Reset move history for new game
+        self.recent_move_surfs.clear()
+        self.game_id = str(uuid.uuid4())  # New game ID
+        self.static_bg = self.new_static_layer()
+        draw_text(self.static_bg, "Entrez votre nom", self.title_font, GOLD, WIDTH / 2, HEIGHT / 2 - 100, centered=True)
+        draw_text(self.static_bg, "Appuyez sur Entrée pour commencer", self.ui_font, WHITE, WIDTH / 2, HEIGHT / 2 + 100, centered=True)
 
     def setup_game(self, num_disks):
-        try:
-            self.game_state = 'game'
-            self.n = max(1, num_disks)  # Ensure at least 1 disk
-            if self.n > 8:  # Cap at 8 to match UI buttons
-                print(f"Number of disks capped at 8: requested {self.n}")
-                self.n = 8
-            self.min_moves = (2**self.n) - 1
-            self.moves, self.animating = 0, False
-            self.towers = [[] for _ in range(3)]; self.disks = []
-            self.dragging_disk = None
-            self.is_solver_used = False  # Reset solver flag
-            base_w, h = 50, 25
-            if not DISK_PALETTE:
-                raise ValueError("DISK_PALETTE is empty")
-            for i in range(self.n, 0, -1):
-                disk = {'size': i, 'color': DISK_PALETTE[i % len(DISK_PALETTE)], 'rect': pygame.Rect(0, 0, base_w + i * 20, h), 'pos': pygame.Vector2(0, 0)}
-                self.disks.append(disk); self.towers[0].append(disk)
-            base_r = pygame.Rect(WIDTH * 0.1, HEIGHT - 200, WIDTH * 0.8, 40)
-            self.tower_rects = [
-                pygame.Rect(base_r.centerx / 2, base_r.top - 300, 20, 300),
-                pygame.Rect(base_r.centerx, base_r.top - 300, 20, 300),
-                pygame.Rect(base_r.centerx * 1.5, base_r.top - 300, 20, 300)
-            ]
-            self.reset_disk_positions()
-            btn_w, btn_h = 170, 50
-            self.ui_buttons = {
-                'solve': {'rect': pygame.Rect(WIDTH - btn_w - 30, HEIGHT - btn_h * 3 - 60, btn_w, btn_h), 'text': 'Solution'},
-                'history': {'rect': pygame.Rect(WIDTH - btn_w - 30, HEIGHT - btn_h * 2 - 40, btn_w, btn_h), 'text': 'Historique'},
-                'back': {'rect': pygame.Rect(WIDTH - btn_w - 30, HEIGHT - btn_h - 30, btn_w, btn_h), 'text': 'Menu'},
-                'solver_explanation': {'rect': pygame.Rect(WIDTH - btn_w - 30, HEIGHT - btn_h * 4 - 80, btn_w, btn_h), 'text': 'Solveur?'}
-            }
-            self.start_time = pygame.time.get_ticks()
-        except Exception as e:
-            print(f"Error in setup_game: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"setup_game error: {str(e)}, num_disks={num_disks}, n={self.n}, towers={self.towers}\n")
-            raise
+        self.game_state = 'game'
+        self.n = max(1, num_disks)  # Ensure at least 1 disk
+        if self.n > 8:  # Cap at 8 to match UI buttons
+            print(f"Number of disks capped at 8: requested {self.n}")
+            self.n = 8
+        self.min_moves = (2**self.n) - 1
+        self.min_moves_text = make_static_text(f"Minimum: {self.min_moves}", self.ui_font, GOLD, 40, 80)
+        self.moves, self.animating = 0, False
+        self.towers = [[] for _ in range(3)]; self.disks = []
+        self.dragging_disk = None
+        self.is_solver_used = False  # Reset solver flag
+        base_w, h = 50, 25
+        if not DISK_PALETTE:
+            raise ValueError("DISK_PALETTE is empty")
+        for i in range(self.n, 0, -1):
+            disk = {'size': i, 'color': DISK_PALETTE[i % len(DISK_PALETTE)], 'rect': pygame.Rect(0, 0, base_w + i * 20, h), 'pos': pygame.Vector2(0, 0)}
+            disk['sprite'] = self.render_disk_sprite(disk)
+            self.disks.append(disk); self.towers[0].append(disk)
+        base_r = pygame.Rect(WIDTH * 0.1, HEIGHT - 200, WIDTH * 0.8, 40)
+        self.tower_rects = [
+            pygame.Rect(base_r.centerx / 2, base_r.top - 300, 20, 300),
+            pygame.Rect(base_r.centerx, base_r.top - 300, 20, 300),
+            pygame.Rect(base_r.centerx * 1.5, base_r.top - 300, 20, 300)
+        ]
+        # Same area as t.inflate(100, 400), precomputed so drops compare plain ints
+        self.tower_bands = [(t.left - 50, t.right + 50, t.top - 200, t.bottom + 200) for t in self.tower_rects]
+        self.reset_disk_positions()
+        btn_w, btn_h = 170, 50
+        self.set_buttons({
+            'solve': {'rect': pygame.Rect(WIDTH - btn_w - 30, HEIGHT - btn_h * 3 - 60, btn_w, btn_h), 'text': 'Solution', 'action': self.start_animation},
+            'history': {'rect': pygame.Rect(WIDTH - btn_w - 30, HEIGHT - btn_h * 2 - 40, btn_w, btn_h), 'text': 'Historique', 'action': self.setup_history},
+            'back': {'rect': pygame.Rect(WIDTH - btn_w - 30, HEIGHT - btn_h - 30, btn_w, btn_h), 'text': 'Menu', 'action': self.setup_menu},
+            'solver_explanation': {'rect': pygame.Rect(WIDTH - btn_w - 30, HEIGHT - btn_h * 4 - 80, btn_w, btn_h), 'text': 'Solveur?', 'action': self.setup_solver_explanation}
+        })
+        self.start_time = pygame.time.get_ticks()
 
     def setup_scoreboard(self):
-        try:
-            self.game_state = 'scoreboard'
-            self.ui_buttons = {}
-            self.selected_score_difficulty = getattr(self, 'n', 5)
-            y, w, h, g = 150, 120, 50, 10; total_w = 6 * (w + g) - g
-            start_x = (WIDTH - total_w) / 2
-            for i in range(3, 9):
-                self.ui_buttons[f'score_{i}'] = {'rect': pygame.Rect(start_x + (i - 3) * (w + g), y, w, h), 'text': f'{i} Disques'}
-            self.ui_buttons['back_menu'] = {'rect': pygame.Rect(30, 30, 150, 60), 'text': 'Menu'}
-        except Exception as e:
-            print(f"Error in setup_scoreboard: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"setup_scoreboard error: {str(e)}, selected_score_difficulty={self.selected_score_difficulty}\n")
-            raise
+        self.game_state = 'scoreboard'
+        buttons = {}
+        self.select_score_difficulty(getattr(self, 'n', 5))
+        y, w, h, g = 150, 120, 50, 10; total_w = 6 * (w + g) - g
+        start_x = (WIDTH - total_w) / 2
+        for i in range(3, 9):
+            buttons[f'score_{i}'] = {'rect': pygame.Rect(start_x + (i - 3) * (w + g), y, w, h), 'text': f'{i} Disques', 'disks': i, 'action': partial(self.select_score_difficulty, i)}
+        buttons['back_menu'] = {'rect': pygame.Rect(30, 30, 150, 60), 'text': 'Menu', 'action': self.setup_menu}
+        self.set_buttons(buttons)
+        self.static_bg = self.new_static_layer()
+        draw_text(self.static_bg, "Tableau des Scores", self.title_font, GOLD, WIDTH / 2, 70, centered=True)
+        headers = ["Rang", "Nom", "Mouvements", "Temps"]
+        for i, header in enumerate(headers): draw_text(self.static_bg, header, self.ui_font, GOLD, 150 + i * 250, 250)
 
     def setup_how_to_play(self):
-        try:
-            self.game_state = 'how_to_play'
-            self.ui_buttons = {}
-            self.ui_buttons['back_menu'] = {'rect': pygame.Rect(30, 30, 150, 60), 'text': 'Retour'}
-        except Exception as e:
-            print(f"Error in setup_how_to_play: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"setup_how_to_play error: {str(e)}\n")
-            raise
+        self.game_state = 'how_to_play'
+        self.set_buttons({'back_menu': {'rect': pygame.Rect(30, 30, 150, 60), 'text': 'Retour', 'action': self.setup_menu}})
+        self.static_bg = self.new_static_layer()
+        draw_text(self.static_bg, "Comment jouer", self.title_font, GOLD, WIDTH / 2, 100, centered=True)
+        instructions = [
+            "Le but est de déplacer tous les disques de la tour de gauche",
+            "vers une autre tour (milieu ou droite), en respectant ces règles :",
+            "1. Déplacez un disque à la fois en cliquant et en le glissant.",
+            "2. Un disque plus grand ne peut pas être posé sur un disque plus petit.",
+            "3. Utilisez la tour du milieu comme tour auxiliaire si nécessaire.",
+            "4. Cliquez sur 'Solution' pour voir une résolution automatique.",
+            "5. Essayez de minimiser le nombre de mouvements !"
+        ]
+        for i, line in enumerate(instructions):
+            draw_text(self.static_bg, line, self.ui_font, WHITE, WIDTH / 2, 200 + i * 40, centered=True)
+        self.static_bg.blit(self.logo_img, self.logo_pos)
+        self.draw_credits(self.static_bg)
 
     def setup_solver_explanation(self):
-        try:
-            self.game_state = 'solver_explanation'
-            self.ui_buttons = {
-                'back_menu': {'rect': pygame.Rect(30, 30, 150, 60), 'text': 'Retour'}
-            }
-        except Exception as e:
-            print(f"Error in setup_solver_explanation: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"setup_solver_explanation error: {str(e)}\n")
-            raise
+        self.game_state = 'solver_explanation'
+        self.set_buttons({
+            'back_menu': {'rect': pygame.Rect(30, 30, 150, 60), 'text': 'Retour', 'action': self.setup_menu}
+        })
+        self.static_bg = self.new_static_layer()
+        draw_text(self.static_bg, "Solveur?", self.title_font, GOLD, WIDTH / 2, 50, centered=True)
+        explanation = [
+            "Le problème des Tours de Hanoï est résolu par une approche récursive.",
+            "Pour n disques, la solution suit ces étapes :",
+            "1. Déplacez n-1 disques de la tour source à la tour auxiliaire.",
+            "2. Déplacez le disque le plus grand de la tour source à la tour destination.",
+            "3. Déplacez les n-1 disques de la tour auxiliaire à la tour destination.",
+            "Cette récursivité se répète jusqu'à 1 disque.",
+            "Le nombre minimum de mouvements est donné par la formule : 2ⁿ - 1.",
+            "Exemple : Pour 3 disques, 2³ - 1 = 7 mouvements.",
+            "Dérivation mathématique :",
+            "  - Pour 1 disque : 1 mouvement.",
+            "  - Pour n disques : 2 * (2^(n-1) - 1) + 1 = 2ⁿ - 1.",
+            "Le solveur utilise cette logique pour générer la séquence optimale."
+        ]
+        for i, line in enumerate(explanation):
+            draw_text(self.static_bg, line, self.ui_font, WHITE, WIDTH / 2, 150 + i * 40, centered=True)
+        self.static_bg.blit(self.logo_img, self.logo_pos)
+        self.draw_credits(self.static_bg)
 
     def setup_history(self):
-        try:
-            self.game_state = 'history'
-            self.ui_buttons = {
-                'back_menu': {'rect': pygame.Rect(30, 30, 150, 60), 'text': 'Retour'}
-            }
-        except Exception as e:
-            print(f"Error in setup_history: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"setup_history error: {str(e)}\n")
-            raise
+        self.game_state = 'history'
+        self.load_move_history()
+        self.set_buttons({
+            'back_menu': {'rect': pygame.Rect(30, 30, 150, 60), 'text': 'Retour', 'action': self.setup_menu}
+        })
+
+    def select_score_difficulty(self, num_disks):
+        # Filter, sort and render the top 10 once per selection instead of every frame
+        self.selected_score_difficulty = num_disks
+        filtered_scores = sorted([s for s in self.scores if s.get('disks') == num_disks], key=lambda s: (s.get('moves', 999), s.get('time', 999)))
+        self.score_row_blits = []
+        for i, score in enumerate(filtered_scores[:10]):
+            time_val = score.get('time', 0); minutes, seconds = divmod(time_val, 60)
+            time_str = f"{int(minutes):02}:{seconds:05.2f}"
+            row = [f"#{i+1}", score.get('name', '???'), str(score.get('moves', '-')), time_str]
+            for j, item in enumerate(row):
+                self.score_row_blits.append((self.ui_font.render(item, True, WHITE).convert_alpha(), (150 + j * 250, 300 + i * 40)))
 
     # --- EVENT HANDLERS ---
     def handle_menu_events(self, event):
-        try:
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                for name, btn in self.ui_buttons.items():
-                    if btn['rect'].collidepoint(event.pos):
-                        self.sounds['drop'].play()
-                        if 'disk' in name: self.setup_get_name(int(name.split('_')[1]))
-                        elif name == 'scoreboard': self.setup_scoreboard()
-                        elif name == 'how_to_play': self.setup_how_to_play()
-                        elif name == 'solver_explanation': self.setup_solver_explanation()
-        except Exception as e:
-            print(f"Error in handle_menu_events: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"handle_menu_events error: {str(e)}, ui_buttons={self.ui_buttons}\n")
-            raise
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.click_button(event.pos)
 
     def handle_get_name_events(self, event):
-        try:
-            if self.name_input and self.name_input.handle_event(event) == 'enter' and len(self.name_input.text.strip()) > 0:
-                self.player_name = self.name_input.text.strip()
-                self.sounds['drop'].play()
-                self.setup_game(self.pending_disks)
-        except Exception as e:
-            print(f"Error in handle_get_name_events: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"handle_get_name_events error: {str(e)}, pending_disks={self.pending_disks}\n")
-            raise
+        if self.name_input and self.name_input.handle_event(event) == 'enter' and len(self.name_input.text.strip()) > 0:
+            self.player_name = self.name_input.text.strip()
+            self.sounds['drop'].play()
+            self.setup_game(self.pending_disks)
 
     def handle_game_events(self, event):
         if self.animating: return
@@ -309,27 +416,19 @@ class HanoiGUI:
             mouse_pos = pygame.mouse.get_pos()
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if not self.dragging_disk:
-                    if self.ui_buttons.get('back') and self.ui_buttons['back']['rect'].collidepoint(mouse_pos):
-                        self.sounds['drop'].play(); self.setup_menu(); return
-                    if self.ui_buttons.get('solve') and self.ui_buttons['solve']['rect'].collidepoint(mouse_pos):
-                        self.sounds['drop'].play(); self.start_animation(); return
-                    if self.ui_buttons.get('history') and self.ui_buttons['history']['rect'].collidepoint(mouse_pos):
-                        self.sounds['drop'].play(); self.setup_history(); return
-                    if self.ui_buttons.get('solver_explanation') and self.ui_buttons['solver_explanation']['rect'].collidepoint(mouse_pos):
-                        self.sounds['drop'].play(); self.setup_solver_explanation(); return
+                    if self.click_button(mouse_pos): return
                     for i, tower in enumerate(self.towers):
                         if tower and tower[-1]['rect'].collidepoint(mouse_pos):
                             self.source_tower_idx = i
                             self.dragging_disk = self.towers[i].pop()
                             self.sounds['pickup'].play(); return
             if event.type == pygame.MOUSEMOTION and self.dragging_disk:
-                self.dragging_disk['pos'] = pygame.Vector2(mouse_pos)
+                self.dragging_disk['pos'].update(mouse_pos)  # In place: no Vector2 per motion event
             if event.type == pygame.MOUSEBUTTONUP and event.button == 1 and self.dragging_disk:
                 target_idx = self.get_tower_at(mouse_pos)
                 if target_idx is not None and not (0 <= target_idx < len(self.towers)):
                     print(f"Invalid target_idx: {target_idx}")
-                    with open("error.log", "a") as f:
-                        f.write(f"Invalid target_idx in handle_game_events: {target_idx}, towers={self.towers}, source_tower_idx={self.source_tower_idx}\n")
+                    logger.error("Invalid target_idx in handle_game_events: %s, towers=%s, source_tower_idx=%s", target_idx, self.towers, self.source_tower_idx)
                     self.towers[self.source_tower_idx].append(self.dragging_disk)
                     self.sounds['invalid'].play()
                     self.dragging_disk = None; self.reset_disk_positions()
@@ -339,7 +438,7 @@ class HanoiGUI:
                     self.towers[target_idx].append(self.dragging_disk)
                     if self.source_tower_idx != target_idx:
                         self.moves += 1
-                        self.move_history.append({'source': self.source_tower_idx + 1, 'destination': target_idx + 1})
+                        self.record_move(self.source_tower_idx + 1, target_idx + 1)
                     self.sounds['drop'].play()
                 else:
                     self.towers[self.source_tower_idx].append(self.dragging_disk)
@@ -347,236 +446,95 @@ class HanoiGUI:
                 self.dragging_disk = None; self.reset_disk_positions(); self.check_win()
         except Exception as e:
             print(f"Error in handle_game_events: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"handle_game_events error: {str(e)}, state: n={self.n}, towers={self.towers}, target_idx={target_idx if 'target_idx' in locals() else 'undefined'}\n")
+            logger.exception("handle_game_events error: %s, state: n=%s, towers=%s, target_idx=%s", e, self.n, self.towers, target_idx if 'target_idx' in locals() else 'undefined')
             self.sounds['invalid'].play()
             self.dragging_disk = None
             self.reset_disk_positions()
 
     def handle_win_events(self, event):
-        try:
-            if event.type == pygame.KEYDOWN or (event.type == pygame.MOUSEBUTTONDOWN and event.button == 1): self.setup_scoreboard()
-        except Exception as e:
-            print(f"Error in handle_win_events: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"handle_win_events error: {str(e)}\n")
-            raise
+        if event.type == pygame.KEYDOWN or (event.type == pygame.MOUSEBUTTONDOWN and event.button == 1): self.setup_scoreboard()
 
     def handle_scoreboard_events(self, event):
-        try:
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                for name, btn in self.ui_buttons.items():
-                    if btn['rect'].collidepoint(event.pos):
-                        self.sounds['drop'].play()
-                        if 'score_' in name: self.selected_score_difficulty = int(name.split('_')[1])
-                        elif name == 'back_menu': self.setup_menu()
-        except Exception as e:
-            print(f"Error in handle_scoreboard_events: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"handle_scoreboard_events error: {str(e)}, ui_buttons={self.ui_buttons}\n")
-            raise
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.click_button(event.pos)
 
     def handle_how_to_play_events(self, event):
-        try:
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                for name, btn in self.ui_buttons.items():
-                    if btn['rect'].collidepoint(event.pos) and name == 'back_menu':
-                        self.sounds['drop'].play()
-                        self.setup_menu()
-        except Exception as e:
-            print(f"Error in handle_how_to_play_events: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"handle_how_to_play_events error: {str(e)}, ui_buttons={self.ui_buttons}\n")
-            raise
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.click_button(event.pos)
 
     def handle_solver_explanation_events(self, event):
-        try:
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                for name, btn in self.ui_buttons.items():
-                    if btn['rect'].collidepoint(event.pos) and name == 'back_menu':
-                        self.sounds['drop'].play()
-                        self.setup_menu()
-        except Exception as e:
-            print(f"Error in handle_solver_explanation_events: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"handle_solver_explanation_events error: {str(e)}, ui_buttons={self.ui_buttons}\n")
-            raise
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.click_button(event.pos)
 
     def handle_history_events(self, event):
-        try:
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                for name, btn in self.ui_buttons.items():
-                    if btn['rect'].collidepoint(event.pos) and name == 'back_menu':
-                        self.sounds['drop'].play()
-                        self.setup_menu()
-        except Exception as e:
-            print(f"Error in handle_history_events: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"handle_history_events error: {str(e)}, ui_buttons={self.ui_buttons}\n")
-            raise
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.click_button(event.pos)
 
     # --- DRAWING FUNCTIONS ---
     def draw_menu(self):
-        try:
-            self.screen.blit(self.background_img, (0, 0))
-            draw_text(self.screen, "Tours de Hanoï", self.title_font, WHITE, WIDTH / 2, 150, centered=True)
-            draw_text(self.screen, "Choisissez une difficulté", self.menu_font, GOLD, WIDTH / 2, 220, centered=True)
-            self.draw_buttons(self.ui_buttons)
-            self.screen.blit(self.logo_img, (WIDTH - self.logo_img.get_width() - 30, 30))  # Logo top-right
-            self.draw_credits()
-        except Exception as e:
-            print(f"Error in draw_menu: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_menu error: {str(e)}\n")
-            raise
+        self.screen.blit(self.static_bg, (0, 0))
+        self.draw_buttons(self.ui_buttons)
 
     def draw_get_name(self):
-        try:
-            self.screen.blit(self.background_img, (0, 0))
-            self.draw_frosted_overlay()
-            draw_text(self.screen, "Entrez votre nom", self.title_font, GOLD, WIDTH / 2, HEIGHT / 2 - 100, centered=True)
-            if self.name_input: self.name_input.update(); self.name_input.draw(self.screen)
-            draw_text(self.screen, "Appuyez sur Entrée pour commencer", self.ui_font, WHITE, WIDTH / 2, HEIGHT / 2 + 100, centered=True)
-        except Exception as e:
-            print(f"Error in draw_get_name: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_get_name error: {str(e)}\n")
-            raise
+        self.screen.blit(self.static_bg, (0, 0))
+        if self.name_input: self.name_input.update(); self.name_input.draw(self.screen)
 
     def draw_game(self):
-        try:
-            self.screen.blit(self.background_img, (0, 0))
-            self.draw_scenery(); self.draw_disks(); self.draw_buttons(self.ui_buttons)
-            self.screen.blit(self.logo_img, (WIDTH - self.logo_img.get_width() - 30, 30))
-            draw_text(self.screen, f"Mouvements: {self.moves}", self.ui_font, WHITE, 40, 40)
-            draw_text(self.screen, f"Minimum: {self.min_moves}", self.ui_font, GOLD, 40, 80)
-            if not self.animating:
-                elapsed_time = (pygame.time.get_ticks() - self.start_time) / 1000
-                minutes, seconds = divmod(elapsed_time, 60)
-                draw_text(self.screen, f"Temps: {int(minutes):02}:{int(seconds):02}", self.ui_font, WHITE, 40, 120)
-            # Draw last 5 moves
-            draw_text(self.screen, "Derniers Coups:", self.ui_font, GOLD, 40, 160)
-            for i, move in enumerate(self.move_history[-5:]):  # Show last 5 moves
-                move_text = f"{move['source']} -> {move['destination']}"
-                draw_text(self.screen, move_text, self.ui_font, WHITE, 40, 200 + i * 40)
-            self.draw_credits()
-        except Exception as e:
-            print(f"Error in draw_game: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_game error: {str(e)}, n={self.n}, towers={self.towers}\n")
-            raise
+        self.screen.blit(self.background_img, (0, 0))
+        self.draw_scenery(); self.draw_disks(); self.draw_buttons(self.ui_buttons)
+        self.draw_label('moves', self.ui_font, WHITE, 40, 40, "Mouvements: {}", self.moves)
+        if not self.animating:
+            self.shown_seconds = self.elapsed_seconds()
+            self.draw_label('time', self.ui_font, WHITE, 40, 120, "Temps: {:02}:{:02}", *divmod(self.shown_seconds, 60))
+        # Logo, fixed labels and the last 5 moves go to the screen in one batched call
+        self.screen.blits([(self.logo_img, self.logo_pos), self.min_moves_text, self.recent_moves_title]
+                          + [(move_surf, (40, 200 + i * 40)) for i, move_surf in enumerate(self.recent_move_surfs)], doreturn=False)
+        self.draw_credits()
 
     def draw_win(self):
-        try:
+        # The board is frozen once won: render it under the overlay on the first frame only
+        if self.win_bg is None:
             self.draw_game(); self.draw_frosted_overlay()
-            for p in self.particles: p.update(); p.draw(self.screen)
-            self.particles = [p for p in self.particles if p.life > 0]
+            self.win_bg = self.screen.copy()
             message = "L'ordinateur a gagné !" if self.is_solver_used else ("Parfait !" if self.moves == self.min_moves else "Bravo !")
-            draw_text(self.screen, message, self.title_font, GOLD, WIDTH / 2, HEIGHT / 2 - 100, centered=True)
-            draw_text(self.screen, f"{self.player_name}, vous avez gagné !" if not self.is_solver_used else "Résolu par l'ordinateur !", self.menu_font, WHITE, WIDTH / 2, HEIGHT / 2, centered=True)
-            draw_text(self.screen, "Appuyez pour voir les scores", self.ui_font, WHITE, WIDTH / 2, HEIGHT / 2 + 100, centered=True)
-        except Exception as e:
-            print(f"Error in draw_win: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_win error: {str(e)}, particles={len(self.particles)}\n")
-            raise
+            self.win_texts = [
+                make_static_text(message, self.title_font, GOLD, WIDTH / 2, HEIGHT / 2 - 100, centered=True),
+                make_static_text(f"{self.player_name}, vous avez gagné !" if not self.is_solver_used else "Résolu par l'ordinateur !", self.menu_font, WHITE, WIDTH / 2, HEIGHT / 2, centered=True),
+                make_static_text("Appuyez pour voir les scores", self.ui_font, WHITE, WIDTH / 2, HEIGHT / 2 + 100, centered=True)
+            ]
+        else:
+            self.screen.blit(self.win_bg, (0, 0))
+        self.particles.update(); self.particles.draw(self.screen)
+        self.screen.blits(self.win_texts, doreturn=False)
 
     def draw_scoreboard(self):
-        try:
-            self.screen.blit(self.background_img, (0, 0)); self.draw_frosted_overlay()
-            draw_text(self.screen, "Tableau des Scores", self.title_font, GOLD, WIDTH / 2, 70, centered=True)
-            self.draw_buttons(self.ui_buttons)
-            headers = ["Rang", "Nom", "Mouvements", "Temps"]
-            for i, header in enumerate(headers): draw_text(self.screen, header, self.ui_font, GOLD, 150 + i * 250, 250)
-            filtered_scores = sorted([s for s in self.scores if s.get('disks') == self.selected_score_difficulty], key=lambda s: (s.get('moves', 999), s.get('time', 999)))
-            for i, score in enumerate(filtered_scores[:10]):
-                y = 300 + i * 40; time_val = score.get('time', 0); minutes, seconds = divmod(time_val, 60)
-                time_str = f"{int(minutes):02}:{seconds:05.2f}"
-                data = [f"#{i+1}", score.get('name', '???'), str(score.get('moves', '-')), time_str]
-                for j, item in enumerate(data): draw_text(self.screen, item, self.ui_font, WHITE, 150 + j * 250, y)
-        except Exception as e:
-            print(f"Error in draw_scoreboard: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_scoreboard error: {str(e)}, selected_score_difficulty={self.selected_score_difficulty}\n")
-            raise
+        self.screen.blit(self.static_bg, (0, 0))
+        self.draw_buttons(self.ui_buttons)
+        self.screen.blits(self.score_row_blits, doreturn=False)
 
     def draw_how_to_play(self):
-        try:
-            self.screen.blit(self.background_img, (0, 0))
-            self.draw_frosted_overlay()
-            draw_text(self.screen, "Comment jouer", self.title_font, GOLD, WIDTH / 2, 100, centered=True)
-            instructions = [
-                "Le but est de déplacer tous les disques de la tour de gauche",
-                "vers une autre tour (milieu ou droite), en respectant ces règles :",
-                "1. Déplacez un disque à la fois en cliquant et en le glissant.",
-                "2. Un disque plus grand ne peut pas être posé sur un disque plus petit.",
-                "3. Utilisez la tour du milieu comme tour auxiliaire si nécessaire.",
-                "4. Cliquez sur 'Solution' pour voir une résolution automatique.",
-                "5. Essayez de minimiser le nombre de mouvements !"
-            ]
-            for i, line in enumerate(instructions):
-                draw_text(self.screen, line, self.ui_font, WHITE, WIDTH / 2, 200 + i * 40, centered=True)
-            self.draw_buttons(self.ui_buttons)
-            self.screen.blit(self.logo_img, (WIDTH - self.logo_img.get_width() - 30, 30))
-            self.draw_credits()
-        except Exception as e:
-            print(f"Error in draw_how_to_play: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_how_to_play error: {str(e)}\n")
-            raise
+        self.screen.blit(self.static_bg, (0, 0))
+        self.draw_buttons(self.ui_buttons)
 
     def draw_solver_explanation(self):
-        try:
-            self.screen.blit(self.background_img, (0, 0))
-            self.draw_frosted_overlay()
-            draw_text(self.screen, "Solveur?", self.title_font, GOLD, WIDTH / 2, 50, centered=True)
-            explanation = [
-                "Le problème des Tours de Hanoï est résolu par une approche récursive.",
-                "Pour n disques, la solution suit ces étapes :",
-                "1. Déplacez n-1 disques de la tour source à la tour auxiliaire.",
-                "2. Déplacez le disque le plus grand de la tour source à la tour destination.",
-                "3. Déplacez les n-1 disques de la tour auxiliaire à la tour destination.",
-                "Cette récursivité se répète jusqu'à 1 disque.",
-                "Le nombre minimum de mouvements est donné par la formule : 2ⁿ - 1.",
-                "Exemple : Pour 3 disques, 2³ - 1 = 7 mouvements.",
-                "Dérivation mathématique :",
-                "  - Pour 1 disque : 1 mouvement.",
-                "  - Pour n disques : 2 * (2^(n-1) - 1) + 1 = 2ⁿ - 1.",
-                "Le solveur utilise cette logique pour générer la séquence optimale."
-            ]
-            for i, line in enumerate(explanation):
-                draw_text(self.screen, line, self.ui_font, WHITE, WIDTH / 2, 150 + i * 40, centered=True)
-            self.draw_buttons(self.ui_buttons)
-            self.screen.blit(self.logo_img, (WIDTH - self.logo_img.get_width() - 30, 30))
-            self.draw_credits()
-        except Exception as e:
-            print(f"Error in draw_solver_explanation: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_solver_explanation error: {str(e)}\n")
-            raise
+        self.screen.blit(self.static_bg, (0, 0))
+        self.draw_buttons(self.ui_buttons)
 
     def draw_history(self):
-        try:
-            self.screen.blit(self.background_img, (0, 0))
-            self.draw_frosted_overlay()
-            draw_text(self.screen, "Historique des Parties", self.title_font, GOLD, WIDTH / 2, 50, centered=True)
-            y_start = 150
-            for game in self.full_move_history:
-                if game['game_id'] == self.game_id:
-                    draw_text(self.screen, f"Partie: {game['player_name']} ({game['disks']} disques)", self.menu_font, WHITE, WIDTH / 2, y_start, centered=True)
-                    y_start += 50
-                    for i, move in enumerate(game['moves']):
-                        move_text = f"Coup {i+1}: {move['source']} -> {move['destination']}"
-                        draw_text(self.screen, move_text, self.ui_font, WHITE, WIDTH / 2, y_start + i * 40, centered=True)
-                    y_start += len(game['moves']) * 40 + 50
-            self.draw_buttons(self.ui_buttons)
-            self.screen.blit(self.logo_img, (WIDTH - self.logo_img.get_width() - 30, 30))
-            self.draw_credits()
-        except Exception as e:
-            print(f"Error in draw_history: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_history error: {str(e)}\n")
-            raise
+        self.screen.blit(self.frosted_bg, (0, 0))
+        self.screen.blit(*self.history_title)
+        y_start = 150
+        for game in self.full_move_history:
+            if game['game_id'] == self.game_id:
+                self.draw_cached_text(self.screen, f"Partie: {game['player_name']} ({game['disks']} disques)", self.menu_font, WHITE, WIDTH / 2, y_start, centered=True)
+                y_start += 50
+                for i, move in enumerate(game['moves']):
+                    move_text = f"Coup {i+1}: {move['source']} -> {move['destination']}"
+                    self.draw_cached_text(self.screen, move_text, self.ui_font, WHITE, WIDTH / 2, y_start + i * 40, centered=True)
+                y_start += len(game['moves']) * 40 + 50
+        self.draw_buttons(self.ui_buttons)
+        self.screen.blit(self.logo_img, self.logo_pos)
+        self.draw_credits()
 
     # --- CORE LOGIC & ANIMATION ---
     def start_animation(self):
@@ -584,67 +542,75 @@ class HanoiGUI:
             self.animating = True
             self.is_solver_used = True  # Set flag when solver is used
             self.move_history = []  # Clear move history for solver
+            self.recent_move_surfs.clear()
             self.moves = 0  # Reset move count
 
             # Use main game state instead of temporary state
             self.reset_disk_positions()
-            original_buttons = self.ui_buttons.copy()
+            original_buttons = self.ui_buttons
             solve_rect = original_buttons.get('solve', {}).get('rect', pygame.Rect(0,0,1,1))
-            self.ui_buttons['stop'] = {'rect': solve_rect, 'text': 'Arrêter', 'color': STOP_RED}
-            del self.ui_buttons['solve']
+            anim_buttons = {name: btn for name, btn in original_buttons.items() if name != 'solve'}
+            anim_buttons['stop'] = {'rect': solve_rect, 'text': 'Arrêter', 'color': STOP_RED}
+            self.set_buttons(anim_buttons)
 
-            solution = hanoi_solver(self.n, 0, 2, 1)
+            solution = hanoi_moves(self.n, 0, 2, 1)  # Solved once per disk count, then reused
 
             for src, dest in solution:
                 # Validate tower indices
                 if not (0 <= src < len(self.towers) and 0 <= dest < len(self.towers)):
                     print(f"Invalid move: source={src}, destination={dest}")
-                    with open("error.log", "a") as f:
-                        f.write(f"Invalid move in animation: source={src}, destination={dest}, n={self.n}, towers={self.towers}\n")
+                    logger.error("Invalid move in animation: source=%s, destination=%s, n=%s, towers=%s", src, dest, self.n, self.towers)
                     self.sounds['invalid'].play()
-                    self.ui_buttons = original_buttons
+                    self.set_buttons(original_buttons)
                     self.animating = False
                     return
                 
-                # Event handling to allow stopping the animation
-                for event in pygame.event.get():
+                # Event handling to allow stopping the animation; only quits and clicks matter,
+                # the rest is flushed without building Event objects
+                stop_events = pygame.event.get([pygame.QUIT, pygame.MOUSEBUTTONDOWN])
+                pygame.event.clear(pump=False)
+                for event in stop_events:
                     if event.type == pygame.QUIT: pygame.quit(); sys.exit()
                     if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        if self.ui_buttons['stop']['rect'].collidepoint(event.pos):
+                        if self.button_at(event.pos) == 'stop':
                             self.sounds['invalid'].play()
-                            self.ui_buttons = original_buttons
+                            self.set_buttons(original_buttons)
                             self.animating = False
                             return
 
                 if not self.towers[src]:
                     print(f"No disk to move from source tower {src}")
-                    with open("error.log", "a") as f:
-                        f.write(f"No disk to move in animation: source={src}, towers={self.towers}\n")
+                    logger.error("No disk to move in animation: source=%s, towers=%s", src, self.towers)
                     continue
 
                 # Move disk in main game state
                 disk_to_move = self.towers[src].pop()
-                self.move_history.append({'source': src + 1, 'destination': dest + 1})
+                self.record_move(src + 1, dest + 1)
                 self.moves += 1
 
                 # Animate disk movement
-                start_pos = disk_to_move['pos'].copy()
-                mid_pos = pygame.Vector2((self.tower_rects[src].centerx + self.tower_rects[dest].centerx) / 2, 150)
-                end_pos = pygame.Vector2(self.tower_rects[dest].centerx, self.tower_rects[dest].bottom - (len(self.towers[dest]) * disk_to_move['rect'].height))
+                # Waypoints as plain (x, y) tuples: arc_point only unpacks them
+                start_pos = tuple(disk_to_move['pos'])
+                mid_pos = ((self.tower_rects[src].centerx + self.tower_rects[dest].centerx) / 2, 150)
+                end_pos = (self.tower_rects[dest].centerx, self.tower_rects[dest].bottom - (len(self.towers[dest]) * disk_to_move['rect'].height))
                 
-                for i in range(int(0.4 * FPS)):
-                    progress = ease_out_quad(i / int(0.4 * FPS))
-                    if progress < 0.5:
-                        disk_to_move['pos'] = start_pos.lerp(mid_pos, progress * 2)
-                    else:
-                        disk_to_move['pos'] = mid_pos.lerp(end_pos, (progress - 0.5) * 2)
+                # Everything under the moving disk is fixed for this move (counters, history,
+                # resting disks): draw the game screen once and reuse it for every tick
+                self.draw_game()
+                anim_bg = self.screen.copy()
+                prev_rect = disk_to_move['rect'].copy()
+                for i, progress in enumerate(MOVE_EASING):
+                    disk_to_move['pos'].update(arc_point(progress, start_pos, mid_pos, end_pos))
                     
-                    # Draw using draw_game to include move history
-                    self.draw_game()
+                    self.screen.blit(anim_bg, (0, 0))
                     self.draw_single_disk(disk_to_move)  # Draw moving disk on top
                     self.draw_buttons(self.ui_buttons)
                     self.draw_credits()
-                    pygame.display.flip()
+                    # The first tick of a move shows the new counters and the last landing; after
+                    # that only the disk's old and new spots and the hoverable buttons can change
+                    if i == 0: pygame.display.flip()
+                    else: pygame.display.update([prev_rect, disk_to_move['rect']] + self.button_rects)
+                    prev_rect = disk_to_move['rect'].copy()
                     self.clock.tick(FPS)
                 
                 # Place disk on destination tower
@@ -652,98 +618,156 @@ class HanoiGUI:
                 self.reset_disk_positions()
 
             # Animation finished
-            self.ui_buttons = original_buttons
+            self.set_buttons(original_buttons)
             self.animating = False
             self.check_win()
         except Exception as e:
             print(f"Animation error: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"Animation error: {str(e)}, n={self.n}, towers={self.towers}\n")
+            logger.exception("Animation error: %s, n=%s, towers=%s", e, self.n, self.towers)
             self.sounds['invalid'].play()
-            self.ui_buttons = original_buttons
+            self.set_buttons(original_buttons)
             self.animating = False
 
     def check_win(self):
         try:
             if self.towers and len(self.towers) >= 3 and (len(self.towers[1]) == self.n or len(self.towers[2]) == self.n):
                 if self.game_state == 'win': return # Already in win state
-                self.sounds['win'].play(); self.game_state = 'win'
+                self.sounds['win'].play(); self.game_state = 'win'; self.win_bg = None
                 time_taken = (pygame.time.get_ticks() - self.start_time) / 1000
                 if not self.is_solver_used:  # Only add score if solver wasn't used
                     self.scores.append({'name': self.player_name, 'disks': self.n, 'time': time_taken, 'moves': self.moves})
                     self.save_scoreboard()
                 # Save move history
-                self.full_move_history.append({
+                self.load_move_history()
+                record = {
                     'game_id': self.game_id,
                     'player_name': self.player_name,
                     'disks': self.n,
                     'moves': self.move_history,
                     'time': time_taken
-                })
-                self.save_move_history()
+                }
+                self.full_move_history.append(record)
+                self.save_move_history(record)
                 win_tower_idx = 1 if len(self.towers[1]) == self.n else 2
                 if not DISK_PALETTE:
                     raise ValueError("DISK_PALETTE is empty")
                 for _ in range(100):
-                    self.particles.append(Particle(self.tower_rects[win_tower_idx].centerx, self.tower_rects[win_tower_idx].centery, random.choice(DISK_PALETTE)))
+                    self.particles.emit(self.tower_rects[win_tower_idx].centerx, self.tower_rects[win_tower_idx].centery, random.choice(DISK_PALETTE))
         except Exception as e:
             print(f"Error in check_win: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"check_win error: {str(e)}, n={self.n}, towers={self.towers}\n")
+            logger.exception("check_win error: %s, n=%s, towers=%s", e, self.n, self.towers)
 
     # --- HELPER FUNCTIONS ---
+    def elapsed_seconds(self):
+        return (pygame.time.get_ticks() - self.start_time) // 1000
+
+    def idle_frame_changed(self):
+        # Whether the current state looks different now even though no event arrived
+        if self.game_state == 'game': return self.elapsed_seconds() != self.shown_seconds
+        if self.game_state == 'win': return len(self.particles) > 0
+        return self.game_state in ANIMATED_STATES
+
+    def record_move(self, source, destination):
+        # Log a move (1-based tower numbers) and keep its sidebar label ready to blit
+        self.move_history.append({'source': source, 'destination': destination})
+        self.recent_move_surfs.append(self.cached_text_surface(f"{source} -> {destination}", self.ui_font, WHITE))
+
+    def set_buttons(self, buttons):
+        # Keep names and rects in flat parallel lists so hit-tests skip the nested dicts
+        self.ui_buttons = buttons
+        self.button_names = list(buttons)
+        self.button_rects = [btn['rect'] for btn in buttons.values()]
+        self.button_actions = [btn.get('action') for btn in buttons.values()]
+        # Button labels never change, so render and center each one up front
+        for btn in buttons.values():
+            btn['label'] = self.cached_text_surface(btn['text'], self.ui_font, WHITE)
+            btn['label_rect'] = btn['label'].get_rect(center=btn['rect'].center)
+
+    def button_at(self, pos):
+        # collidelist scans the rect list in C; a 1x1 rect at pos hits exactly what collidepoint would
+        hit = pygame.Rect(pos, (1, 1)).collidelist(self.button_rects)
+        return self.button_names[hit] if hit >= 0 else None
+
+    def click_button(self, pos):
+        # Play the click sound and run the bound action of the button under pos, if any
+        hit = pygame.Rect(pos, (1, 1)).collidelist(self.button_rects)
+        if hit < 0: return False
+        self.sounds['drop'].play()
+        action = self.button_actions[hit]
+        if action: action()
+        return True
+
     def draw_buttons(self, buttons):
-        try:
-            mouse_pos = pygame.mouse.get_pos()
-            for name, btn in buttons.items():
-                # Safely check if the button name has a numeric suffix (e.g., score_3, disk_5)
-                is_selected = False
-                if 'score' in name:
-                    name_parts = name.split('_')
-                    if len(name_parts) > 1 and name_parts[1].isdigit():
-                        is_selected = int(name_parts[1]) == self.selected_score_difficulty
-                default_color = btn.get('color', PRIMARY_BLUE if is_selected else SECONDARY_BLUE)
-                color = tuple(min(255, c * 1.2) for c in default_color) if btn['rect'].collidepoint(mouse_pos) else default_color
-                pygame.draw.rect(self.screen, color, btn['rect'], border_radius=10)
-                pygame.draw.rect(self.screen, WHITE, btn['rect'], 3, border_radius=10)
-                draw_text(self.screen, btn['text'], self.ui_font, WHITE, btn['rect'].centerx, btn['rect'].centery, centered=True)
-        except Exception as e:
-            print(f"Error in draw_buttons: {e}, button_name={name}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_buttons error: {str(e)}, button_name={name}, buttons={buttons}\n")
-            raise
+        # One collidelist call finds the hovered button; score buttons carry their disk count
+        hovered = self.button_at(pygame.mouse.get_pos())
+        for name, btn in buttons.items():
+            is_selected = btn.get('disks') == self.selected_score_difficulty
+            default_color = btn.get('color', PRIMARY_BLUE if is_selected else SECONDARY_BLUE)
+            if name == hovered:
+                color = HOVER_COLORS.get(default_color) or tuple(min(255, c * 1.2) for c in default_color)
+            else:
+                color = default_color
+            pygame.draw.rect(self.screen, color, btn['rect'], border_radius=10)
+            pygame.draw.rect(self.screen, WHITE, btn['rect'], 3, border_radius=10)
+            self.screen.blit(btn['label'], btn['label_rect'])
+
+    def cached_text_surface(self, text, font, color):
+        # Render each distinct (text, font, color) once and hand back the shared surface
+        key = (text, id(font), color)
+        text_surface = self.text_cache.get(key)
+        if text_surface is None:
+            text_surface = self.text_cache[key] = font.render(text, True, color).convert_alpha()
+        return text_surface
+
+    def draw_cached_text(self, surface, text, font, color, x, y, centered=False):
+        # Same contract as utils.draw_text, but each distinct label is rendered only once
+        try:
+            text_surface = self.cached_text_surface(text, font, color)
+            text_rect = text_surface.get_rect()
+            if centered:
+                text_rect.center = (x, y)
+            else:
+                text_rect.topleft = (x, y)
+            surface.blit(text_surface, text_rect)
+        except Exception as e:
+            print(f"Error in draw_cached_text: {e}")
+            logger.exception("draw_cached_text error: %s, text=%s", e, text)
+
+    def render_disk_sprite(self, disk):
+        # Disk geometry and colors are fixed for a game, so draw fill and border once
+        color = disk.get('color', (128, 128, 128))
+        sprite = pygame.Surface(disk['rect'].size, pygame.SRCALPHA).convert_alpha()
+        pygame.draw.rect(sprite, color, sprite.get_rect(), border_radius=5)
+        border_color = [min(255, c * 0.8) for c in color]
+        pygame.draw.rect(sprite, border_color, sprite.get_rect(), 3, border_radius=5)
+        return sprite
+
+    def draw_label(self, slot, font, color, x, y, fmt, *values):
+        # One cached surface per slot, formatted and re-rendered only when its values
+        # change; used for counters like the move count and timer that would flood text_cache
+        try:
+            cached = self.label_cache.get(slot)
+            if cached is None or cached[0] != values:
+                cached = self.label_cache[slot] = (values, font.render(fmt.format(*values), True, color).convert_alpha())
+            self.screen.blit(cached[1], (x, y))
+        except Exception as e:
+            print(f"Error in draw_label: {e}")
+            logger.exception("draw_label error: %s, slot=%s, values=%s", e, slot, values)
 
     def draw_single_disk(self, disk):
-        try:
-            color = disk.get('color', (128, 128, 128))
-            disk['rect'].center = disk['pos']
-            pygame.draw.rect(self.screen, color, disk['rect'], border_radius=5)
-            border_color = [min(255, c * 0.8) for c in color]
-            pygame.draw.rect(self.screen, border_color, disk['rect'], 3, border_radius=5)
-        except Exception as e:
-            print(f"Error in draw_single_disk: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_single_disk error: {str(e)}, disk={disk}\n")
-            raise
+        disk['rect'].center = disk['pos']
+        self.screen.blit(disk['sprite'], disk['rect'])
 
-    def draw_credits(self):
-        try:
-            draw_text(self.screen, "Designed by Redha_AGGOUN@La Plateforme_ 11.07.2025", self.credit_font, (255, 255, 255, 150), WIDTH / 2, HEIGHT - 20, centered=True)
-        except Exception as e:
-            print(f"Error in draw_credits: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_credits error: {str(e)}\n")
-            raise
+    def draw_credits(self, surface=None):
+        (surface or self.screen).blit(*self.credits_text)
 
-    def draw_frosted_overlay(self):
-        try:
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA); overlay.blit(self.blurred_background, (0, 0))
-            pygame.draw.rect(overlay, (0, 0, 0, 100), (0, 0, WIDTH, HEIGHT)); self.screen.blit(overlay, (0, 0))
-        except Exception as e:
-            print(f"Error in draw_frosted_overlay: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_frosted_overlay error: {str(e)}\n")
-            raise
+    def draw_frosted_overlay(self, surface=None):
+        (surface or self.screen).blit(self.frosted_overlay, (0, 0))
+
+    def new_static_layer(self, frosted=True):
+        # Full-screen copy of the background that setup_* methods paint their
+        # static text onto once, so draw_* only has to blit it back each frame
+        return (self.frosted_bg if frosted else self.background_img).copy()
 
     def reset_disk_positions(self):
         try:
@@ -751,47 +775,40 @@ class HanoiGUI:
             for i, tower in enumerate(self.towers):
                 if i >= len(self.tower_rects):
                     print(f"Invalid tower index: {i}")
-                    with open("error.log", "a") as f:
-                        f.write(f"reset_disk_positions error: invalid tower index {i}, towers={self.towers}, tower_rects={self.tower_rects}\n")
+                    logger.error("reset_disk_positions error: invalid tower index %s, towers=%s, tower_rects=%s", i, self.towers, self.tower_rects)
                     return
+                # Move each disk's existing Vector2 rather than allocating a new one
+                centerx, bottom = self.tower_rects[i].centerx, self.tower_rects[i].bottom
                 for j, disk in enumerate(tower):
-                    disk['pos'] = pygame.Vector2(self.tower_rects[i].centerx, self.tower_rects[i].bottom - j * disk['rect'].height)
+                    disk['pos'].update(centerx, bottom - j * disk['rect'].height)
         except Exception as e:
             print(f"Error in reset_disk_positions: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"reset_disk_positions error: {str(e)}, towers={self.towers}, tower_rects={self.tower_rects}\n")
+            logger.exception("reset_disk_positions error: %s, towers=%s, tower_rects=%s", e, self.towers, self.tower_rects)
 
     def draw_scenery(self):
-        try:
-            if not self.tower_rects: return
-            base = pygame.Rect(WIDTH * 0.1, HEIGHT - 200, WIDTH * 0.8, 40)
-            pygame.draw.rect(self.screen, (30, 30, 30), base, border_top_left_radius=10, border_top_right_radius=10)
-            for t in self.tower_rects: pygame.draw.rect(self.screen, (80, 80, 80), t, border_radius=5)
-        except Exception as e:
-            print(f"Error in draw_scenery: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_scenery error: {str(e)}, tower_rects={self.tower_rects}\n")
-            raise
+        if not self.tower_rects: return
+        base = pygame.Rect(WIDTH * 0.1, HEIGHT - 200, WIDTH * 0.8, 40)
+        pygame.draw.rect(self.screen, (30, 30, 30), base, border_top_left_radius=10, border_top_right_radius=10)
+        for t in self.tower_rects: pygame.draw.rect(self.screen, (80, 80, 80), t, border_radius=5)
 
     def draw_disks(self):
-        try:
-            disks_to_draw = [d for t in self.towers for d in t]
-            for disk in disks_to_draw:
-                if disk != self.dragging_disk: self.draw_single_disk(disk)
-            if self.dragging_disk: self.draw_single_disk(self.dragging_disk)
-        except Exception as e:
-            print(f"Error in draw_disks: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"draw_disks error: {str(e)}, towers={self.towers}, dragging_disk={self.dragging_disk}\n")
-            raise
+        # Stacked disks go out in one batched blits() call; a disk being dragged
+        # has been popped off its tower and is drawn on top afterwards
+        sequence = []
+        for tower in self.towers:
+            for disk in tower:
+                disk['rect'].center = disk['pos']
+                sequence.append((disk['sprite'], disk['rect']))
+        self.screen.blits(sequence, doreturn=False)
+        if self.dragging_disk: self.draw_single_disk(self.dragging_disk)
 
     def get_tower_at(self, pos):
         try:
-            for i, t in enumerate(self.tower_rects):
-                if t.inflate(100, 400).collidepoint(pos): return i
+            px, py = pos
+            for i, (left, right, top, bottom) in enumerate(self.tower_bands):
+                if left <= px < right and top <= py < bottom: return i
             return None
         except Exception as e:
             print(f"Error in get_tower_at: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"get_tower_at error: {str(e)}, tower_rects={self.tower_rects}, pos={pos}\n")
+            logger.exception("get_tower_at error: %s, tower_bands=%s, pos=%s", e, self.tower_bands, pos)
             return None
\ No newline at end of file
@@ -1,20 +1,33 @@
 # /hanoi-tower/main.py
 import sys
+import logging
+import logging.handlers
 from graphics import HanoiGUI
 
+class SnapshotMemoryHandler(logging.handlers.MemoryHandler):
+    # Buffered records are only formatted at flush time; merge the %s args into the
+    # message now so error.log shows the game state at the time of the error
+    def emit(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        super().emit(record)
+
 if __name__ == "__main__":
     """
     Point d'entrée de l'application. Crée et lance l'interface graphique.
     Toute la logique est gérée au sein de la classe HanoiGUI.
     """
+    # One error.log handler for the whole app; records are held in memory and written
+    # in batches of 50, at once for the CRITICAL record of a fatal error, or at exit
+    # when logging.shutdown flushes whatever is left
+    file_handler = logging.FileHandler("error.log", delay=True)
+    file_handler.setFormatter(logging.Formatter("%(asctime)s %(name)s: %(message)s"))
+    logging.basicConfig(level=logging.ERROR, handlers=[SnapshotMemoryHandler(50, flushLevel=logging.CRITICAL, target=file_handler)])
     try:
         game_app = HanoiGUI()
         game_app.run()
     except Exception as e:
+        # Already logged with its traceback where it was raised (HanoiGUI.__init__ or run)
         print(f"Une erreur fatale est survenue: {e}")
-        # Optionally create a simple error log file
-        # The typo "withYou" has been corrected to "with" on the next line
-        with open("error.log", "w") as f:
-            f.write(str(e))
         sys.exit(1)
         
\ No newline at end of file
@@ -1,13 +1,29 @@
 # /hanoi-tower/solve.py
+from functools import lru_cache
+from itertools import permutations
+
+
+@lru_cache(maxsize=None)
+def hanoi_moves(n, source, destination, auxiliary):
+    """
+    Returns the optimal (source, destination) moves that carry n disks from
+    source to destination as a tuple, cached per (n, source, destination,
+    auxiliary) and shared by every later call with the same arguments.
+    """
+    # Same recurrence as the recursive solution, built bottom-up: level k holds the
+    # k-disk solution for each of the six peg orderings, so no call stack grows with n
+    level = {pegs: () for pegs in permutations((source, destination, auxiliary))}
+    for _ in range(n):
+        level = {(s, d, a): level[(s, a, d)] + ((s, d),) + level[(a, d, s)] for s, d, a in level}
+    return level[(source, destination, auxiliary)]
+
+
 def hanoi_solver(n, source, destination, auxiliary):
     """
-    Solves the Tower of Hanoi problem recursively.
+    Solves the Tower of Hanoi problem.
     Returns the list of moves.
+    The solution is built iteratively (no recursion limit for large n) and
+    memoized per (n, source, destination, auxiliary), so repeated calls are a
+    lookup and a copy.
     """
-    moves = []
-    if n > 0:
-        moves.extend(hanoi_solver(n - 1, source, auxiliary, destination))
-        moves.append((source, destination))
-        moves.extend(hanoi_solver(n - 1, auxiliary, destination, source))
-        return moves
-    return []
\ No newline at end of file
+    return list(hanoi_moves(n, source, destination, auxiliary))
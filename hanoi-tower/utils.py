@@ -1,6 +1,9 @@
 import pygame
 import math
 import random
+import logging
+
+logger = logging.getLogger(__name__)
 
 def draw_text(surface, text, font, color, x, y, centered=False):
     try:
@@ -13,45 +16,85 @@ def draw_text(surface, text, font, color, x, y, centered=False):
         surface.blit(text_surface, text_rect)
     except Exception as e:
         print(f"Error in draw_text: {e}")
-        with open("error.log", "a") as f:
-            f.write(f"draw_text error: {str(e)}, text={text}\n")
+        logger.exception("draw_text error: %s, text=%s", e, text)
+
+def make_static_text(text, font, color, x, y, centered=False):
+    # Render a fixed label once and return the (surface, rect) pair to blit,
+    # positioned the same way draw_text would place it
+    text_surface = font.render(text, True, color).convert_alpha()
+    if centered:
+        return text_surface, text_surface.get_rect(center=(x, y))
+    return text_surface, text_surface.get_rect(topleft=(x, y))
 
 def ease_out_quad(t):
     return 1 - (1 - t) * (1 - t)
 
-class Particle:
-    def __init__(self, x, y, color):
+def arc_point(progress, start, mid, end):
+    # Point along start -> mid -> end at an already eased progress, computed on
+    # plain floats so the animation tick does not allocate intermediate Vector2 objects
+    if progress < 0.5:
+        (ax, ay), (bx, by), k = start, mid, progress * 2
+    else:
+        (ax, ay), (bx, by), k = mid, end, (progress - 0.5) * 2
+    return ax + (bx - ax) * k, ay + (by - ay) * k
+
+def coalesce_mouse_motion(events):
+    # Consecutive MOUSEMOTION events only matter for their last position,
+    # so keep the newest one of each run and pass everything else through.
+    merged = []
+    for event in events:
+        if event.type == pygame.MOUSEMOTION and merged and merged[-1].type == pygame.MOUSEMOTION:
+            merged[-1] = event
+        else:
+            merged.append(event)
+    return merged
+
+class ParticleSystem:
+    # Struct-of-arrays storage: one list per attribute instead of one object per
+    # particle, so a frame's update is a few list comprehensions over flat data
+    def __init__(self):
+        self.x, self.y, self.vx, self.vy = [], [], [], []
+        self.life, self.size, self.color = [], [], []
+
+    def __len__(self):
+        return len(self.x)
+
+    def emit(self, x, y, color):
         try:
-            self.x = x
-            self.y = y
-            self.vx = (2 * random.random() - 1) * 5
-            self.vy = (2 * random.random() - 1) * 5
-            self.color = color
-            self.life = 100
-            self.size = 5
+            self.x.append(x)
+            self.y.append(y)
+            self.vx.append((2 * random.random() - 1) * 5)
+            self.vy.append((2 * random.random() - 1) * 5)
+            self.life.append(100)
+            self.size.append(5)
+            self.color.append(color)
         except Exception as e:
-            print(f"Error in Particle.__init__: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"Particle.__init__ error: {str(e)}\n")
+            print(f"Error in ParticleSystem.emit: {e}")
+            logger.exception("ParticleSystem.emit error: %s", e)
 
     def update(self):
         try:
-            self.x += self.vx
-            self.y += self.vy
-            self.life -= 1
-            self.size = max(1, self.size - 0.05)
+            # Drop particles that expired on the previous frame, then advance the rest
+            if any(life <= 0 for life in self.life):
+                alive = [i for i, life in enumerate(self.life) if life > 0]
+                for name in ('x', 'y', 'vx', 'vy', 'life', 'size', 'color'):
+                    values = getattr(self, name)
+                    setattr(self, name, [values[i] for i in alive])
+            self.x = [x + vx for x, vx in zip(self.x, self.vx)]
+            self.y = [y + vy for y, vy in zip(self.y, self.vy)]
+            self.life = [life - 1 for life in self.life]
+            self.size = [max(1, size - 0.05) for size in self.size]
         except Exception as e:
-            print(f"Error in Particle.update: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"Particle.update error: {str(e)}\n")
+            print(f"Error in ParticleSystem.update: {e}")
+            logger.exception("ParticleSystem.update error: %s", e)
 
     def draw(self, surface):
         try:
-            pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), int(self.size))
+            for x, y, size, color in zip(self.x, self.y, self.size, self.color):
+                pygame.draw.circle(surface, color, (int(x), int(y)), int(size))
         except Exception as e:
-            print(f"Error in Particle.draw: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"Particle.draw error: {str(e)}\n")
+            print(f"Error in ParticleSystem.draw: {e}")
+            logger.exception("ParticleSystem.draw error: %s", e)
 
 class TextInputBox:
     def __init__(self, x, y, w, h, font, initial_text=""):
@@ -62,10 +105,10 @@ class TextInputBox:
             self.active = False
             self.cursor_visible = True
             self.cursor_timer = 0
+            self.rendered = (None, None)  # (text, surface) of the last render
         except Exception as e:
             print(f"Error in TextInputBox.__init__: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"TextInputBox.__init__ error: {str(e)}, initial_text={initial_text}\n")
+            logger.exception("TextInputBox.__init__ error: %s, initial_text=%s", e, initial_text)
             raise
 
     def handle_event(self, event):
@@ -82,8 +125,7 @@ class TextInputBox:
             return None
         except Exception as e:
             print(f"Error in TextInputBox.handle_event: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"TextInputBox.handle_event error: {str(e)}, text={self.text}\n")
+            logger.exception("TextInputBox.handle_event error: %s, text=%s", e, self.text)
             return None
 
     def update(self):
@@ -94,22 +136,23 @@ class TextInputBox:
                 self.cursor_timer = 0
         except Exception as e:
             print(f"Error in TextInputBox.update: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"TextInputBox.update error: {str(e)}\n")
+            logger.exception("TextInputBox.update error: %s", e)
 
     def draw(self, surface):
         try:
             pygame.draw.rect(surface, (255, 255, 255), self.rect, border_radius=10)
             pygame.draw.rect(surface, (0, 0, 0) if self.active else (100, 100, 100), self.rect, 3, border_radius=10)
-            text_surface = self.font.render(self.text, True, (0, 0, 0))
+            # Text only changes on key presses, so re-render it only then
+            if self.rendered[0] != self.text:
+                self.rendered = (self.text, self.font.render(self.text, True, (0, 0, 0)))
+            text_surface = self.rendered[1]
             text_rect = text_surface.get_rect(center=(self.rect.centerx, self.rect.centery))  # Center text vertically
             surface.blit(text_surface, text_rect)
             if self.active and self.cursor_visible:
-                text_width = self.font.render(self.text, True, (0, 0, 0)).get_width()
+                text_width = text_surface.get_width()
                 cursor_x = self.rect.x + 10 + text_width
                 cursor_y = self.rect.centery - text_surface.get_height() // 2
                 pygame.draw.line(surface, (0, 0, 0), (cursor_x, cursor_y + 5), (cursor_x, cursor_y + text_surface.get_height() - 5))
         except Exception as e:
             print(f"Error in TextInputBox.draw: {e}")
-            with open("error.log", "a") as f:
-                f.write(f"TextInputBox.draw error: {str(e)}, text={self.text}\n")
\ No newline at end of file
+            logger.exception("TextInputBox.draw error: %s, text=%s", e, self.text)
\ No newline at end of file